@@ -18,12 +18,14 @@ import asyncio
 import logging
 import time
 import boto3
+from boto3.dynamodb.types import TypeSerializer
 import botocore
 from botocore.exceptions import ClientError
-import requests
-import json
+import aiohttp
 from cassandra.auth import PlainTextAuthProvider
 import threading
+import concurrent.futures
+import itertools
 import random
 import re
 
@@ -65,21 +67,37 @@ def full_query(table, ConsistentRead=True, **kwargs):
         items.extend(response['Items'])
     return items
 
-# FIXME: boto3 is NOT async. So all tests that use it are not really async.
-# We could use the aioboto3 library to write a really asynchronous test, or
-# implement an async wrapper to the boto3 functions ourselves (e.g., run them
-# in a separate thread) ourselves.
+# Note that boto3 is NOT async, so its calls block the event loop. Tests
+# which need the event loop to keep running while they make boto3 calls
+# (e.g., to poll metrics or make concurrent requests), or which make many
+# calls in a loop, should run those calls in a separate thread with
+# asyncio.to_thread().
+
+
+# An HTTP client session for the test's requests, which keeps connections
+# to each node alive between requests instead of reconnecting every time.
+@pytest.fixture(scope="function")
+async def http_session():
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+# Send a "/localnodes" request to Alternator on the given node and return
+# the list of node addresses in its response. Alternator's /localnodes is
+# plain HTTP, so aiohttp is used to avoid blocking the event loop.
+async def get_localnodes(session, ip, params=None):
+    url = f"http://{ip}:{alternator_config['alternator_port']}/localnodes"
+    async with session.get(url, params=params) as response:
+        # Don't insist on a JSON content type, just parse the body
+        return await response.json(content_type=None)
 
 
 test_table_prefix = 'alternator_Test_'
+# Table names are numbered starting from the current time in milliseconds,
+# and incremented on each call, so they are unique even if several names
+# are generated in the same millisecond.
+table_name_counter = itertools.count(time.time_ns() // 1_000_000)
 def unique_table_name():
-    current_ms = int(round(time.time() * 1000))
-    # If unique_table_name() is called twice in the same millisecond...
-    if unique_table_name.last_ms >= current_ms:
-        current_ms = unique_table_name.last_ms + 1
-    unique_table_name.last_ms = current_ms
-    return test_table_prefix + str(current_ms)
-unique_table_name.last_ms = 0
+    return test_table_prefix + str(next(table_name_counter))
 
 
 async def test_alternator_ttl_scheduling_group(manager: ManagerClient):
@@ -108,60 +126,87 @@ async def test_alternator_ttl_scheduling_group(manager: ManagerClient):
     # Enable expiration (TTL) on attribute "expiration"
     table.meta.client.update_time_to_live(TableName=table.name, TimeToLiveSpecification={'AttributeName': 'expiration', 'Enabled': True})
 
-    # Insert N rows, setting them all to expire 3 seconds from now.
-    N = 100
+    # Insert N rows, setting them all to expire 3 seconds from now. N doesn't
+    # need to be large: the test only needs some deletions and several scans
+    # to happen, and we check the ratio of CPU time, not its amount.
+    N = 20
     expiration = int(time.time())+3
-    with table.batch_writer() as batch:
-        for p in range(N):
-            batch.put_item(Item={'p': p, 'expiration': expiration})
+    # boto3 is not async, so do the writes in a thread, to not block the
+    # event loop while the batches are sent.
+    def insert_items():
+        with table.batch_writer(overwrite_by_pkeys=['p']) as batch:
+            for p in range(N):
+                batch.put_item(Item={'p': p, 'expiration': expiration})
+    await asyncio.to_thread(insert_items)
 
 
     # Unfortunately, Alternator has no way of doing the writes above with
-    # CL=ALL, only CL=QUORUM. So at this point we're not sure all the writes
-    # above have completed. We want to wait until they are over, so that we
-    # won't measure any of those writes in the statement scheduling group.
-    # Let's do it by checking the metrics of background writes and wait for
-    # them to drop to zero.
-    ips = [server.ip_addr for server in await manager.running_servers()]
+    # CL=ALL, only CL=QUORUM. We also can't write these items through CQL
+    # with CL=ALL instead: Alternator stores the non-key attributes (like
+    # "expiration") serialized in its own format in the ":attrs" column, so
+    # the items need to be written by Alternator. So at this point we're not
+    # sure all the writes above have completed. We want to wait until they
+    # are over, so that we won't measure any of those writes in the statement
+    # scheduling group. Let's do it by checking the metrics of background
+    # writes and wait for them to drop to zero.
+    ips = tuple(server.ip_addr for server in servers)
+    # A snapshot of the metrics of all nodes. They are queried concurrently,
+    # so each snapshot costs one round trip.
+    async def snapshot_metrics():
+        return await asyncio.gather(*(manager.metrics.query(ip) for ip in ips))
+    # The sum of a metric over all nodes (and shards) in a snapshot. A
+    # metric missing on some node is an error, unless a default is given
+    # for metrics which are not reported until they are non-zero.
+    def sum_metric(snapshot, name, labels={}, default=None):
+        total = 0
+        for metrics in snapshot:
+            value = metrics.get(name, labels)
+            if value is None:
+                assert default is not None, f"metric {name} {labels} is missing"
+                value = default
+            total += value
+        return total
+    # The background writes usually finish very quickly, so start polling
+    # often and back off if they don't.
     timeout = time.time() + 60
+    interval = 0.02
     while True:
         if time.time() > timeout:
             pytest.fail("timed out waiting for background writes to complete")
-        bg_writes = 0
-        for ip in ips:
-            metrics = await manager.metrics.query(ip)
-            bg_writes += metrics.get('scylla_storage_proxy_coordinator_background_writes')
-        if bg_writes == 0:
+        before = await snapshot_metrics()
+        if sum_metric(before, 'scylla_storage_proxy_coordinator_background_writes') == 0:
             break # done waiting for the background writes to finish
-        await asyncio.sleep(0.1)
-
-    # Get the current amount of work (in CPU ms) done across all nodes and
-    # shards in different scheduling groups. We expect this to increase
-    # considerably for the streaming group while expiration scanning is
-    # proceeding, but not increase at all for the statement group because
+        await asyncio.sleep(interval)
+        interval = min(interval * 2, 0.2)
+
+    # The snapshot which saw no background writes has the current amount of
+    # work (in CPU ms) done across all nodes and shards in different
+    # scheduling groups, so it is where we start measuring. We expect this to
+    # increase considerably for the streaming group while expiration scanning
+    # is proceeding, but not increase at all for the statement group because
     # there are no requests being executed.
-    async def get_cpu_metrics():
-        ms_streaming = 0
-        ms_statement = 0
-        for ip in ips:
-            metrics = await manager.metrics.query(ip)
-            ms_streaming += metrics.get('scylla_scheduler_runtime_ms', {'group': 'streaming'})
-            # in enterprise, default execution is in sl:default, not statement
-            ms_statement += metrics.get('scylla_scheduler_runtime_ms', {'group': 'sl:default'})
-        return (ms_streaming, ms_statement)
-
-    ms_streaming_before, ms_statement_before = await get_cpu_metrics()
-
-    # Wait until all rows expire, and get the CPU metrics again. All items
+    #
+    # Wait until all rows expire, and take another snapshot. All items
     # were set to expire in 3 seconds, and the expiration thread is set up
     # in alternator_config to scan the whole table in 0.5 seconds, and the
-    # whole table is just 100 rows, so we expect all the data to be gone in
-    # 4 seconds. Let's wait 5 seconds just in case. Even if not all the data
-    # will have been deleted by then, we do expect some deletions to have
-    # happened, and certainly several scans, all taking CPU which we expect
-    # to be in the right scheduling group.
-    await asyncio.sleep(5)
-    ms_streaming_after, ms_statement_after = await get_cpu_metrics()
+    # whole table is just N=20 rows, so we expect all the data to be gone in
+    # 4 seconds. Instead of always sleeping, we watch the expiration metrics
+    # and stop as soon as all N items were deleted, but wait 5 seconds at
+    # most just in case. We don't check this with a scan, as it would add
+    # work to the statement group. Even if not all the data will have been
+    # deleted by then, we do expect some deletions to have happened, and
+    # certainly several scans, all taking CPU which we expect to be in the
+    # right scheduling group.
+    timeout = time.time() + 5
+    while True:
+        await asyncio.sleep(0.25)
+        after = await snapshot_metrics()
+        # This metric is skipped when empty, so it's missing until the
+        # node deleted some items.
+        items_deleted = (sum_metric(after, 'scylla_expiration_items_deleted', default=0) -
+                         sum_metric(before, 'scylla_expiration_items_deleted', default=0))
+        if items_deleted >= N or time.time() > timeout:
+            break
 
     # As a sanity check, verify some of the data really expired, so there
     # was some TTL work actually done. We actually expect all of the data
@@ -169,16 +214,20 @@ async def test_alternator_ttl_scheduling_group(manager: ManagerClient):
     # test machines, this may not be the case.
     assert N > table.scan(ConsistentRead=True, Select='COUNT')['Count']
 
-    # Between the calls to get_cpu_metrics() above, several expiration scans
-    # took place (we configured scans to happen every 0.5 seconds), and also
+    # Between the two snapshots above, several expiration scans took place
+    # (we configured scans to happen every 0.5 seconds), and also
     # a lot of deletes when the expiration time was reached. We expect all
     # that work to have happened in the streaming group, not statement group,
     # so "ratio" calculate below should be tiny, even exactly zero. Before
     # issue #18719 was fixed, it was not tiny at all - 0.58.
     # Just in case there are other unknown things happening, let's assert it
     # is <0.1 instead of zero.
-    ms_streaming = ms_streaming_after - ms_streaming_before
-    ms_statement = ms_statement_after - ms_statement_before
+    def cpu_ms(group):
+        return (sum_metric(after, 'scylla_scheduler_runtime_ms', {'group': group}) -
+                sum_metric(before, 'scylla_scheduler_runtime_ms', {'group': group}))
+    ms_streaming = cpu_ms('streaming')
+    # in enterprise, default execution is in sl:default, not statement
+    ms_statement = cpu_ms('sl:default')
     ratio = ms_statement / ms_streaming
     assert ratio < 0.1
 
@@ -234,9 +283,7 @@ async def test_alternator_ttl_multinode_expiration(manager: ManagerClient, with_
     # expired - so a scan should return no responses. This should happen
     # even though one of the nodes is down and not doing its usual
     # expiration-scanning work.
-    timeout = time.time() + 60
-    items = -1
-    while items != 0 and time.time() < timeout:
+    def count_items():
         response = table.scan(ConsistentRead=True)
         items = len(response['Items'])
         # In theory (though probably not in practice in this test), a scan()
@@ -245,12 +292,17 @@ async def test_alternator_ttl_multinode_expiration(manager: ManagerClient, with_
         while items == 0 and 'LastEvaluatedKey' in response:
             response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], ConsistentRead=True)
             items += len(response['Items'])
+        return items
+    timeout = time.time() + 60
+    items = -1
+    while items != 0 and time.time() < timeout:
+        items = await asyncio.to_thread(count_items)
         if items == 0:
             break
-        time.sleep(0.1)
+        await asyncio.sleep(0.1)
     assert items == 0
 
-async def test_localnodes_broadcast_rpc_address(manager: ManagerClient):
+async def test_localnodes_broadcast_rpc_address(manager: ManagerClient, http_session):
     """Test that if the "broadcast_rpc_address" of a node is set, the
        "/localnodes" request returns not the node's internal IP address,
        but rather the one set in broadcast_rpc_address as passed between
@@ -278,102 +330,87 @@ async def test_localnodes_broadcast_rpc_address(manager: ManagerClient):
         # We need the retry loop below because the second node might take a
         # bit of time to bootstrap after coming up, and only then will it
         # appear on /localnodes (see #19694).
-        url = f"http://{server.ip_addr}:{config['alternator_port']}/localnodes"
         timeout = time.time() + 60
         while True:
             assert time.time() < timeout
-            response = requests.get(url, verify=False)
-            j = json.loads(response.content.decode('utf-8'))
+            j = await get_localnodes(http_session, server.ip_addr)
             if j == ['127.0.0.0', '127.0.0.0']:
                 break # done
             await asyncio.sleep(0.1)
 
-async def test_localnodes_drained_node(manager: ManagerClient):
-    """Test that if in a cluster one node is brought down with "nodetool drain"
-       a "/localnodes" request should NOT return that node. This test does
-       NOT reproduce issue #19694 - a DRAINED node is not considered is_alive()
-       and even before the fix of that issue, "/localnodes" didn't return it.
+# The following two tests need the same setup - a cluster of two nodes, with
+# "/localnodes" on the first node returning both - and the same check after
+# they bring the second node down, so they share these two functions. The
+# cluster itself can't be shared, as each test brings down a node.
+async def start_two_localnodes(manager, http_session):
+    """Start a cluster with two nodes and wait until "/localnodes" on the
+       first node returns both nodes. We need the retry loop below because
+       the second node might take a bit of time to bootstrap after coming
+       up, and only then will it appear on /localnodes (see #19694).
     """
-    # Start a cluster with two nodes and verify that at this point,
-    # "/localnodes" on the first node returns both nodes.
-    # We the retry loop below because the second node might take a
-    # bit of time to bootstrap after coming up, and only then will it
-    # appear on /localnodes (see #19694).
     servers = await manager.servers_add(2, config=alternator_config)
-    localnodes_request = f"http://{servers[0].ip_addr}:{alternator_config['alternator_port']}/localnodes"
+    both = {servers[0].ip_addr, servers[1].ip_addr}
     async def check_localnodes_two():
-        response = requests.get(localnodes_request)
-        j = json.loads(response.content.decode('utf-8'))
-        if set(j) == {servers[0].ip_addr, servers[1].ip_addr}:
+        nodes = set(await get_localnodes(http_session, servers[0].ip_addr))
+        if nodes == both:
             return True
-        elif set(j).issubset({servers[0].ip_addr, servers[1].ip_addr}):
+        elif nodes.issubset(both):
             return None # try again
         else:
             return False
     assert await wait_for(check_localnodes_two, time.time() + 60)
-    # Now "nodetool" drain on the second node, leaving the second node
-    # in DRAINED state.
-    await manager.api.client.post("/storage_service/drain", host=servers[1].ip_addr)
-    # After that, "/localnodes" should no longer return the second node.
-    # It might take a short while until the first node learns what happened
-    # to node 1, so we may need to retry for a while
+    return servers
+
+async def wait_for_localnodes_one(http_session, servers):
+    """Wait until "/localnodes" on the first of the two servers no longer
+       returns the second one, which the test brought down. It might take
+       a short while until the first node learns what happened to the
+       second, so we may need to retry for a while.
+    """
+    both = {servers[0].ip_addr, servers[1].ip_addr}
+    first = {servers[0].ip_addr}
     async def check_localnodes_one():
-        response = requests.get(localnodes_request)
-        j = json.loads(response.content.decode('utf-8'))
-        if set(j) == {servers[0].ip_addr, servers[1].ip_addr}:
+        nodes = set(await get_localnodes(http_session, servers[0].ip_addr))
+        if nodes == both:
             return None # try again
-        elif set(j) == {servers[0].ip_addr}:
+        elif nodes == first:
             return True
         else:
             return False
     assert await wait_for(check_localnodes_one, time.time() + 60)
 
+async def test_localnodes_drained_node(manager: ManagerClient, http_session):
+    """Test that if in a cluster one node is brought down with "nodetool drain"
+       a "/localnodes" request should NOT return that node. This test does
+       NOT reproduce issue #19694 - a DRAINED node is not considered is_alive()
+       and even before the fix of that issue, "/localnodes" didn't return it.
+    """
+    servers = await start_two_localnodes(manager, http_session)
+    # Now "nodetool" drain on the second node, leaving the second node
+    # in DRAINED state.
+    await manager.api.client.post("/storage_service/drain", host=servers[1].ip_addr)
+    # After that, "/localnodes" should no longer return the second node.
+    await wait_for_localnodes_one(http_session, servers)
+
 
-async def test_localnodes_down_normal_node(manager: ManagerClient):
+async def test_localnodes_down_normal_node(manager: ManagerClient, http_session):
     """Test that if in a cluster one node reaches "normal" state and then
        brought down (so is now in "DN" state), a "/localnodes" request
        should NOT return that node. Reproduces issue #21538.
     """
-    # Start a cluster with two nodes and verify that at this point,
-    # "/localnodes" on the first node returns both nodes.
-    # We the retry loop below because the second node might take a
-    # bit of time to bootstrap after coming up, and only then will it
-    # appear on /localnodes (see #19694).
-    servers = await manager.servers_add(2, config=alternator_config)
-    localnodes_request = f"http://{servers[0].ip_addr}:{alternator_config['alternator_port']}/localnodes"
-    async def check_localnodes_two():
-        response = requests.get(localnodes_request)
-        j = json.loads(response.content.decode('utf-8'))
-        if set(j) == {servers[0].ip_addr, servers[1].ip_addr}:
-            return True
-        elif set(j).issubset({servers[0].ip_addr, servers[1].ip_addr}):
-            return None # try again
-        else:
-            return False
-    assert await wait_for(check_localnodes_two, time.time() + 60)
+    servers = await start_two_localnodes(manager, http_session)
     # Now stop the second node abruptly with server_stop(). The server will
     # be down, the gossiper on the first node will soon realize it is down,
     # but still consider it in a "normal" state - "DN" (down and normal).
     # We then want to check that "/localnodes" handles this state correctly.
     await manager.server_stop(servers[1].server_id, convict=True)
     # After that, "/localnodes" should no longer return the second node.
-    # It might take a short while until the first node learns what happened
-    # to the second, so we may need to retry for a while.
-    async def check_localnodes_one():
-        response = requests.get(localnodes_request)
-        j = json.loads(response.content.decode('utf-8'))
-        if set(j) == {servers[0].ip_addr, servers[1].ip_addr}:
-            return None # try again
-        elif set(j) == {servers[0].ip_addr}:
-            return True
-        else:
-            return False
-    assert await wait_for(check_localnodes_one, time.time() + 60)
+    await wait_for_localnodes_one(http_session, servers)
 
 
 @pytest.mark.nightly
 @pytest.mark.skip_mode(mode='release', reason='error injections are not supported in release mode')
-async def test_localnodes_joining_nodes(manager: ManagerClient):
+async def test_localnodes_joining_nodes(manager: ManagerClient, http_session):
     """Test that if a cluster is being enlarged and a node is coming up but
        not yet responsive, a "/localnodes" request should NOT return that node.
        Reproduces issue #19694.
@@ -400,9 +437,7 @@ async def test_localnodes_joining_nodes(manager: ManagerClient):
     # (we delayed that with the injection). So the "/localnodes" should still
     # return just one node - not both. Reproduces #19694 (two nodes used to
     # be returned)
-    localnodes_request = f"http://{server.ip_addr}:{alternator_config['alternator_port']}/localnodes"
-    response = requests.get(localnodes_request)
-    j = json.loads(response.content.decode('utf-8'))
+    j = await get_localnodes(http_session, server.ip_addr)
     assert len(j) == 1
 
     # We don't want to wait for the second server to finish its long
@@ -426,7 +461,7 @@ async def test_localnodes_joining_nodes(manager: ManagerClient):
     except Exception as e:
         assert 'Failed to add server' in str(e)
 
-async def test_localnodes_multi_dc_multi_rack(manager: ManagerClient):
+async def test_localnodes_multi_dc_multi_rack(manager: ManagerClient, http_session):
     """A test for /localnodes on a more general setup, with multiple DCs and
        multiple racks - an 8-node setup with two DCs, two racks in each, and
        two nodes in each rack.
@@ -439,71 +474,69 @@ async def test_localnodes_multi_dc_multi_rack(manager: ManagerClient):
     config = alternator_config | {
         'endpoint_snitch': 'GossipingPropertyFileSnitch'
     }
-    servers = {}
-    for dc in ['dc1', 'dc2']:
-        for rack in ['rack1', 'rack2']:
-            servers[dc,rack] = await manager.servers_add(2, config=config, property_file={
-                'dc': dc, 'rack': rack})
-
-    def localnodes_request(server):
-        return f"http://{server.ip_addr}:{alternator_config['alternator_port']}/localnodes"
+    # All 8 nodes are added with one servers_add() call, so they are all
+    # booted concurrently, and then split into servers[dc, rack] lists.
+    dc_racks = [(dc, rack) for dc in ['dc1', 'dc2'] for rack in ['rack1', 'rack2']]
+    all_servers = await manager.servers_add(2 * len(dc_racks), config=config, property_file=[
+        {'dc': dc, 'rack': rack} for dc, rack in dc_racks for _ in range(2)])
+    servers = {dc_rack: all_servers[2*i:2*i+2] for i, dc_rack in enumerate(dc_racks)}
 
     # Before we test various variations of the /localnodes request, let's wait
     # until all nodes are visible to each other in /localnodes requests. This
     # can take time, while nodes finish bootstrapping and gossip to each other
     # (see #19694). After this one-time wait_for, the following checks will be
     # able to check things immediately - without retries.
-    for dc in ['dc1', 'dc2']:
-        for rack in ['rack1', 'rack2']:
-            for server in servers[dc, rack]:
-                async def check_localnodes_eight():
-                    for option_dc in ['dc1', 'dc2']:
-                        response = requests.get(localnodes_request(server), {'dc': option_dc})
-                        if len(json.loads(response.content.decode('utf-8'))) < 4:
-                            return None # try again
-                    return True
-                assert await wait_for(check_localnodes_eight, time.time() + 60)
+    def make_check_localnodes_eight(server):
+        async def check_localnodes_eight():
+            for option_dc in ['dc1', 'dc2']:
+                if len(await get_localnodes(http_session, server.ip_addr, {'dc': option_dc})) < 4:
+                    return None # try again
+            return True
+        return check_localnodes_eight
+    deadline = time.time() + 60
+    results = await asyncio.gather(*(wait_for(make_check_localnodes_eight(server), deadline)
+                                     for server in all_servers))
+    assert all(results)
+
+    # The addresses we expect /localnodes to return for each dc, and for
+    # each rack. The order of the returned addresses doesn't matter, so we
+    # compare them as sets.
+    dc_servers = {dc: servers[dc, 'rack1'] + servers[dc, 'rack2'] for dc in ['dc1', 'dc2']}
+    dc_ips = {dc: frozenset(server.ip_addr for server in dc_servers[dc]) for dc in dc_servers}
+    rack_ips = {dc_rack: frozenset(server.ip_addr for server in servers[dc_rack]) for dc_rack in servers}
+
+    # Each of the checks below sends one request to each of a list of
+    # servers, all at once, and verifies they all return expected_ips.
+    # Checking the length as well ensures no address is returned twice.
+    async def check_localnodes(target_servers, params, expected_ips):
+        results = await asyncio.gather(*(get_localnodes(http_session, server.ip_addr, params) for server in target_servers))
+        for result in results:
+            assert len(result) == len(expected_ips) and frozenset(result) == expected_ips
 
     # Check that the option-less "/localnodes" returns for each of dc1's nodes
     # the four dc1 servers, and for each of dc2's nodes, the four dc2 servers:
     for dc in ['dc1', 'dc2']:
-        dc_servers = servers[dc, 'rack1'] + servers[dc, 'rack2']
-        expected_ips = [server.ip_addr for server in dc_servers]
-        for server in dc_servers:
-            response = requests.get(localnodes_request(server))
-            assert sorted(json.loads(response.content.decode('utf-8'))) == sorted(expected_ips)
+        await check_localnodes(dc_servers[dc], None, dc_ips[dc])
 
     # Check that the "dc" option works - it should return the nodes for the
     # specified DC, regardless of which node on which DC the request is sent
     # to (we test all combinations of one of 8 target nodes and 2 option dcs).
-    all_servers = sum(servers.values(), [])
     for option_dc in ['dc1', 'dc2']:
-        expected_servers = servers[option_dc, 'rack1'] + servers[option_dc, 'rack2']
-        expected_ips = [server.ip_addr for server in expected_servers]
-        for server in all_servers:
-            response = requests.get(localnodes_request(server), {'dc': option_dc})
-            assert sorted(json.loads(response.content.decode('utf-8'))) == sorted(expected_ips)
+        await check_localnodes(all_servers, {'dc': option_dc}, dc_ips[option_dc])
 
     # Check that the "rack" option works (without "dc") - it returns for each of dc1's
     # nodes the same two servers from the specified rack in dc1, and for each of dc2's
     # nodes, the same two dc2 servers in the specified rack:
     for dc in ['dc1', 'dc2']:
-        dc_servers = servers[dc, 'rack1'] + servers[dc, 'rack2']
         for option_rack in ['rack1', 'rack2']:
-            expected_ips = [server.ip_addr for server in servers[dc, option_rack]]
-            for server in dc_servers:
-                response = requests.get(localnodes_request(server), {'rack': option_rack})
-                assert sorted(json.loads(response.content.decode('utf-8'))) == sorted(expected_ips)
+            await check_localnodes(dc_servers[dc], {'rack': option_rack}, rack_ips[dc, option_rack])
 
     # Check that a combination of the "rack" and "dc" option works - it always returns
     # the same two nodes belonging to the given rack and dc, no matter which of the 8
     # servers the request is sent to.
     for option_dc in ['dc1', 'dc2']:
         for option_rack in ['rack1', 'rack2']:
-            expected_ips = [server.ip_addr for server in servers[option_dc, option_rack]]
-            for server in all_servers:
-                response = requests.get(localnodes_request(server), {'dc': option_dc, 'rack': option_rack})
-                assert sorted(json.loads(response.content.decode('utf-8'))) == sorted(expected_ips)
+            await check_localnodes(all_servers, {'dc': option_dc, 'rack': option_rack}, rack_ips[option_dc, option_rack])
 
 
 # We have in test/alternator/test_cql_rbac.py many functional tests for
@@ -563,18 +596,19 @@ async def test_alternator_enforce_authorization_false2(manager: ManagerClient):
     table.get_item(Key={'p': 42})
     table.delete()
 
-def get_secret_key(cql, user):
+async def get_secret_key(cql, user):
     """The secret key used for a user in Alternator is its role's salted_hash.
        This function retrieves it from the system table.
     """
     # Newer Scylla places the "roles" table in the "system" keyspace, but
-    # older versions used "system_auth_v2" or "system_auth"
+    # older versions used "system_auth_v2" or "system_auth", so we try them
+    # in this order and stop at the first one which has the key.
     for ks in ['system', 'system_auth_v2', 'system_auth']:
         try:
-            e = list(cql.execute(f"SELECT salted_hash FROM {ks}.roles WHERE role = '{user}'"))
+            e = await cql.run_async(f"SELECT salted_hash FROM {ks}.roles WHERE role = '{user}'")
             if e != [] and e[0].salted_hash is not None:
                 return e[0].salted_hash
-        except:
+        except Exception:
             pass
     pytest.fail(f"Couldn't get secret key for user {user}")
 
@@ -598,14 +632,20 @@ async def test_alternator_enforce_authorization_true(manager: ManagerClient):
     servers = await manager.servers_add(1, config=config,
         driver_connect_opts={'auth_provider': PlainTextAuthProvider(username='cassandra', password='cassandra')})
     cql = manager.get_cql()
+    # We know that Scylla is set up with a "cassandra" user. Also create a
+    # new role "user2", used below, and retrieve both users' secret keys
+    # concurrently.
+    await cql.run_async("CREATE ROLE user2 WITH PASSWORD = 'user2' AND LOGIN=TRUE")
+    cassandra_key, user2_key = await asyncio.gather(
+        get_secret_key(cql, 'cassandra'), get_secret_key(cql, 'user2'))
     # Any requests from a non-existent user with garbage password is
     # rejected - even requests that don't need special permissions
     alternator = get_alternator(servers[0].ip_addr, 'nonexistent_user', 'garbage')
     with pytest.raises(ClientError, match='UnrecognizedClientException'):
         alternator.meta.client.list_tables()
-    # We know that Scylla is set up with a "cassandra" user. If we retrieve
-    # its correct secret key, the ListTables will work.
-    alternator = get_alternator(servers[0].ip_addr, 'cassandra', get_secret_key(cql, 'cassandra'))
+    # With the correct secret key of the "cassandra" user, the ListTables
+    # will work.
+    alternator = get_alternator(servers[0].ip_addr, 'cassandra', cassandra_key)
     alternator.meta.client.list_tables()
     # Privileged operations also work for the superuser account "cassandra":
     table = alternator.create_table(TableName=unique_table_name(),
@@ -615,9 +655,8 @@ async def test_alternator_enforce_authorization_true(manager: ManagerClient):
     table.put_item(Item={'p': 42})
     table.get_item(Key={'p': 42})
     table.delete()
-    # Create a new role "user2" and make a new connection "alternator2" with it:
-    cql.execute("CREATE ROLE user2 WITH PASSWORD = 'user2' AND LOGIN=TRUE")
-    alternator2 = get_alternator(servers[0].ip_addr, 'user2', get_secret_key(cql, 'user2'))
+    # Make a new connection "alternator2" with the new role "user2":
+    alternator2 = get_alternator(servers[0].ip_addr, 'user2', user2_key)
     # In the new role, ListTables works, but other privileged operations
     # don't.
     alternator2.meta.client.list_tables()
@@ -866,21 +905,70 @@ async def test_rf_rack_flag_enforces_rf_rack_validity(manager: ManagerClient):
             AttributeDefinitions=[{'AttributeName': 'p', 'AttributeType': 'S'}]
         )
 
-# Unfortunately by default a Python thread print the exception that kills
-# it (e.g., pytest assert failures) but it doesn't propagate the exception
-# to the join() - so the overall test doesn't fail. The following ThreadWrapper
-# causes join() to rethrow the exception, so the test will fail.
-class ThreadWrapper(threading.Thread):
-    def run(self):
-        try:
-            self.ret = self._target(*self._args, **self._kwargs)
-        except BaseException as e:
-            self.exception = e
-    def join(self, timeout=None):
-        super().join(timeout)
-        if hasattr(self, 'exception'):
-            raise self.exception
-        return self.ret
+# Wait for all the given awaitables to finish, and then rethrow the first
+# exception (e.g., a pytest assert failure) raised by any of them, so the
+# test fails. Unlike a plain asyncio.gather(), we don't leave the others
+# still running in the background when one of them fails.
+async def gather_all(*aws):
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+# boto3 is not async, so to send several requests concurrently we need to
+# call func(*args) for each of the given args in a separate thread - of the
+# given executor, or by default, of the event loop's default executor. This
+# waits for all the calls to finish, and rethrows the first exception.
+async def run_in_threads(func, args_list, executor=None):
+    loop = asyncio.get_running_loop()
+    return await gather_all(*(loop.run_in_executor(executor, func, *args) for args in args_list))
+
+# The CreateTable parameters, except the table name, of the simple tables
+# which the following tests create over and over. Built once, and only
+# passed to boto3 - which doesn't modify them - so they are never changed.
+# They are kept as plain dicts and lists, because that's what boto3's
+# parameter validation expects.
+CREATE_TEST_TABLE_PARAMS = {
+    'BillingMode': 'PAY_PER_REQUEST',
+    'KeySchema': [{'AttributeName': 'p', 'KeyType': 'HASH' }],
+    'AttributeDefinitions': [{'AttributeName': 'p', 'AttributeType': 'N' }],
+}
+
+# Wait until the table with the given name exists and is ready. boto3's
+# table_exists waiter by default polls only every 20 seconds, which is
+# tuned for DynamoDB's slow table creation, but Alternator tables are
+# usually ready immediately or very soon, so we poll much more often.
+def wait_for_test_table(client, table_name):
+    client.get_waiter('table_exists').wait(TableName=table_name,
+        WaiterConfig={'Delay': 0.1, 'MaxAttempts': 600})
+
+# Create a table with the given name and a simple key schema, and wait
+# until it is ready. Like all boto3 calls, this blocks, so async tests
+# should call it with asyncio.to_thread().
+def create_test_table(client, table_name):
+    client.create_table(TableName=table_name, **CREATE_TEST_TABLE_PARAMS)
+    wait_for_test_table(client, table_name)
+
+# Delete the table with the given name, if it still exists. Like all boto3
+# calls, this blocks, so async tests should call it with asyncio.to_thread().
+def delete_test_table(client, table_name):
+    try:
+        client.delete_table(TableName=table_name)
+    except ClientError as e:
+        code = e.response['Error']['Code']
+        if code == 'ResourceNotFoundException':
+            # The table was already deleted (e.g., by the test's threads),
+            # or never created, that's expected.
+            return
+        elif code == 'ResourceInUseException':
+            # In theory (and in DynamoDB), delete_table() isn't possible
+            # until create_table() completed its asynchronous work. So
+            # wait for the table to become ready, and then delete it.
+            wait_for_test_table(client, table_name)
+            client.delete_table(TableName=table_name)
+        else:
+            raise
 
 # The following tests reproduce issue #13152, where if two schema changes
 # are attempted concurrently, one of them may fail with:
@@ -902,16 +990,75 @@ class ThreadWrapper(threading.Thread):
 # serializes its own schema modifications. This is why these tests must
 # be here, in test/cluster, and not in the single-node test/alternator.
 
+# All the following tests use a cluster of three nodes, and send their
+# concurrent requests each to a different node. This function starts such
+# a cluster and returns a low-level boto3 client to each of its nodes. The
+# tests only make plain API calls, so they don't need the higher-level
+# "resource" returned by get_alternator(), and unlike resources, the
+# low-level clients are also thread-safe.
+async def start_three_clients(manager):
+    servers = await manager.servers_add(3, config=alternator_config, auto_rack_dc='dc1')
+    return [get_alternator(server.ip_addr).meta.client for server in servers]
+
+# The first request on a client has to open a new connection to its node,
+# and so does every request sent while the client's other connections are
+# busy. To keep this setup out of the tests' timing-sensitive requests,
+# this sends "nconnections" cheap requests concurrently through each of
+# the clients, leaving that many open connections in each client's pool
+# (boto3's default pool keeps up to 10). The requests wait for each other
+# on a barrier before being sent, which guarantees that they are really
+# in flight together - and also that each ran in a thread of its own, so
+# the executor has started all these threads before the test needs them.
+async def warm_up_clients(clients, nconnections, executor=None):
+    args_list = [(client,) for client in clients for _ in range(nconnections)]
+    barrier = threading.Barrier(len(args_list), timeout=120)
+    def warm_up(client):
+        barrier.wait()
+        client.list_tables(Limit=1)
+    await run_in_threads(warm_up, args_list, executor)
+
+# Most of the following tests repeat their check "ntries" times, to bring
+# the number of test false-negatives closer to zero. Each try uses its own
+# table: prepare(client, table_name), if given, is called first (e.g., to
+# create the table), and then run_op(client, table_name) is called for all
+# the clients together, each in a separate thread, and released together by
+# a barrier to increase the chance that they collide. The tries are run one
+# after another: Alternator retries a schema change that collided with
+# another only a limited number of times, so running the tries concurrently
+# could exhaust these retries and fail the test even without the bug.
+# Finally, all the tables are deleted - except, if run_op itself deletes
+# the table (deletes_table=True), those of the tries which completed
+# successfully.
+async def run_concurrent_tries(clients, ntries, run_op, prepare=None, deletes_table=False):
+    table_names = [unique_table_name() for _ in range(ntries)]
+    live_tables = set(table_names)
+    # The threads of a try wait on a barrier at the same time, so each needs
+    # a thread of its own: the event loop's default executor may have fewer
+    # threads than that, or have them busy with something else.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        # Warming up also starts all the executor's threads.
+        await warm_up_clients(clients, 1, executor)
+        try:
+            for table_name in table_names:
+                if prepare:
+                    await asyncio.to_thread(prepare, clients[0], table_name)
+                barrier = threading.Barrier(len(clients), timeout=120)
+                def run_op_together(client):
+                    barrier.wait()
+                    run_op(client, table_name)
+                await run_in_threads(run_op_together, [(client,) for client in clients], executor)
+                if deletes_table:
+                    live_tables.discard(table_name)
+        finally:
+            await gather_all(*(asyncio.to_thread(delete_test_table, clients[0], table_name)
+                               for table_name in live_tables))
+
 async def test_concurrent_createtable(manager: ManagerClient):
     """A reproducer for issue #13152 for the CreateTable operation:
        concurrent CreateTable operations shouldn't fail "due to concurrent
        "modification".
     """
-    servers = await manager.servers_add(3, config=alternator_config, auto_rack_dc='dc1')
-    # In boto3, "resources", the object returned by get_alternator(), are
-    # not thread-safe. However, we will create 3 threads each will write to
-    # a different alternators[i], so we're fine.
-    alternators = [get_alternator(server.ip_addr) for server in servers]
+    clients = await start_three_clients(manager)
 
     # Run the CreateTable operation, once, in each thread. There is no point
     # in running multiple CreateTable operations, since only the very first
@@ -921,117 +1068,48 @@ async def test_concurrent_createtable(manager: ManagerClient):
     # together and collide - on my test machine, before #15132 was fixed one
     # attempt here fails around 80% of the time, which is good enough to
     # reproduce the bug and test its fix. Nevertheless, we'll run (below)
-    # the whole check a "ntries" times in a loop, to bring number of test
-    # false-negatives even closer to zero.
-    table_name = unique_table_name()
-    barrier = threading.Barrier(len(servers), timeout=120)
-    def run_op(dynamodb):
-        barrier.wait()
+    # the whole check "ntries" times, to bring number of test false-negatives
+    # even closer to zero.
+    def run_op(client, table_name):
         try:
-            dynamodb.create_table(TableName=table_name,
-                BillingMode='PAY_PER_REQUEST',
-                KeySchema=[{'AttributeName': 'p', 'KeyType': 'HASH' }],
-                AttributeDefinitions=[{'AttributeName': 'p', 'AttributeType': 'N' }])
+            client.create_table(TableName=table_name, **CREATE_TEST_TABLE_PARAMS)
         # Expect either a success or a ResourceInUseException.
         # Anything else (e.g., InternalServerError) is a bug
         except ClientError as e:
-            assert 'ResourceInUseException' in str(e)
-    ntries = 5
-    for i in range(ntries):
-        threads = [ThreadWrapper(target=run_op, args=[dynamodb]) for dynamodb in alternators]
-        for t in threads:
-            t.start()
-        try:
-            for t in threads:
-                t.join()
-            # If we're here, all the threads were successful, and the
-            # test passed. Actually it needs to pass ntries times before
-            # we really declare it successful.
-        finally:
-            barrier.reset()
-            # In theory (and in DynamoDB), delete_table() isn't possible
-            # until create_table() completed its asynchronous work, so
-            # we may need to try delete_table() multiple times.
-            timeout = time.time() + 120
-            while time.time() < timeout:
-                try:
-                    alternators[0].meta.client.delete_table(TableName=table_name)
-                    break
-                except ClientError as ce:
-                    if ce.response['Error']['Code'] == 'ResourceInUseException':
-                        time.sleep(1)
-                        continue
-                    elif ce.response['Error']['Code'] == 'ResourceNotFoundException':
-                        # The table was never created, probably we had an
-                        # exception from the table-creation threads, let's
-                        # not add more error messages here.
-                        break
-                    raise
+            assert e.response['Error']['Code'] == 'ResourceInUseException'
+    # If the test passes, all the threads were successful, in all ntries
+    # tries. If a table was never created, probably we had an exception
+    # from the table-creation threads, and the cleanup will not add more
+    # error messages.
+    await run_concurrent_tries(clients, 5, run_op)
 
 async def test_concurrent_deletetable(manager: ManagerClient):
     """A reproducer for issue #13152 for the DeleteTable operation:
        concurrent DeleteTable operations shouldn't fail "due to concurrent
        "modification".
     """
-    servers = await manager.servers_add(3, config=alternator_config, auto_rack_dc='dc1')
-    alternators = [get_alternator(server.ip_addr) for server in servers]
-    table_name = unique_table_name()
-    barrier = threading.Barrier(len(servers), timeout=120)
-    def run_op(dynamodb):
-        barrier.wait()
+    clients = await start_three_clients(manager)
+    def run_op(client, table_name):
         try:
-            dynamodb.meta.client.delete_table(TableName=table_name)
+            client.delete_table(TableName=table_name)
         # Expect either a success or a ResourceNotFoundException
         # (indicating another thread deleted the table).
         # Anything else (e.g., InternalServerError) is a bug
         except ClientError as e:
-            assert 'ResourceNotFoundException' in str(e)
-    ntries = 5
-    try:
-        for i in range(ntries):
-            alternators[0].create_table(TableName=table_name,
-                BillingMode='PAY_PER_REQUEST',
-                KeySchema=[{'AttributeName': 'p', 'KeyType': 'HASH' }],
-                AttributeDefinitions=[{'AttributeName': 'p', 'AttributeType': 'N' }])
-            alternators[0].meta.client.get_waiter('table_exists').wait(TableName=table_name)
-            threads = [ThreadWrapper(target=run_op, args=[dynamodb]) for dynamodb in alternators]
-            for t in threads:
-                t.start()
-            try:
-                for t in threads:
-                    t.join()
-            finally:
-                barrier.reset()
-                try:
-                    alternators[0].meta.client.delete_table(TableName=table_name)
-                except ClientError as e:
-                    # If we got ResourceNotFoundException, the table was
-                    # already deleted by the threads, that's expected.
-                    if not 'ResourceNotFoundException' in str(e):
-                        raise
-    finally:
-        # Delete the table, if an exception above caused us not to do it.
-        try:
-            alternators[0].meta.client.delete_table(TableName=table_name)
-        except ClientError as e:
-            if not 'ResourceNotFoundException' in str(e):
-                raise
+            assert e.response['Error']['Code'] == 'ResourceNotFoundException'
+    await run_concurrent_tries(clients, 5, run_op, prepare=create_test_table, deletes_table=True)
 
 async def test_concurrent_updatetable(manager: ManagerClient):
     """A reproducer for issue #13152 for the UpdateTable operation:
        concurrent UpdateTable operations shouldn't fail "due to concurrent
        "modification".
     """
-    servers = await manager.servers_add(3, config=alternator_config, auto_rack_dc='dc1')
-    alternators = [get_alternator(server.ip_addr) for server in servers]
-    table_name = unique_table_name()
-    barrier = threading.Barrier(len(servers), timeout=120)
-    def run_op(dynamodb):
-        barrier.wait()
+    clients = await start_three_clients(manager)
+    def run_op(client, table_name):
         try:
             # Pick a slow use case of UpdateTable (adding a GSI) to increase
             # the likelihood of a collision.
-            dynamodb.meta.client.update_table(TableName=table_name,
+            client.update_table(TableName=table_name,
                 AttributeDefinitions=[{ 'AttributeName': 'x', 'AttributeType': 'S' }],
                 GlobalSecondaryIndexUpdates=[ {  'Create':
                     {  'IndexName': 'hello',
@@ -1042,31 +1120,9 @@ async def test_concurrent_updatetable(manager: ManagerClient):
         # already added this GSI.
         # Anything else (e.g., InternalServerError) is a bug
         except ClientError as e:
-            assert 'GSI hello already exists' in str(e)
-    ntries = 5
-    try:
-        for i in range(ntries):
-            alternators[0].create_table(TableName=table_name,
-                BillingMode='PAY_PER_REQUEST',
-                KeySchema=[{'AttributeName': 'p', 'KeyType': 'HASH' }],
-                AttributeDefinitions=[{'AttributeName': 'p', 'AttributeType': 'N' }])
-            alternators[0].meta.client.get_waiter('table_exists').wait(TableName=table_name)
-            threads = [ThreadWrapper(target=run_op, args=[dynamodb]) for dynamodb in alternators]
-            for t in threads:
-                t.start()
-            try:
-                for t in threads:
-                    t.join()
-            finally:
-                barrier.reset()
-                alternators[0].meta.client.delete_table(TableName=table_name)
-    finally:
-        # Delete the table, if an exception above caused us not to do it.
-        try:
-            alternators[0].meta.client.delete_table(TableName=table_name)
-        except ClientError as e:
-            if not 'ResourceNotFoundException' in str(e):
-                raise
+            assert e.response['Error']['Code'] == 'ValidationException'
+            assert 'GSI hello already exists' in e.response['Error']['Message']
+    await run_concurrent_tries(clients, 5, run_op, prepare=create_test_table)
 
 @pytest.mark.parametrize('op', ['TagResource', 'UntagResource', 'UpdateTimeToLive'])
 async def test_concurrent_modify_tags(manager: ManagerClient, op):
@@ -1077,18 +1133,16 @@ async def test_concurrent_modify_tags(manager: ManagerClient, op):
        The name of this test is named after db::modify_tags(), which all
        three of these operations use to implement the change to the table.
     """
-    servers = await manager.servers_add(3, config=alternator_config, auto_rack_dc='dc1')
-    alternators = [get_alternator(server.ip_addr) for server in servers]
+    clients = await start_three_clients(manager)
     table_name = unique_table_name()
-    barrier = threading.Barrier(len(servers), timeout=120)
-    def run_op(dynamodb):
+    def run_op(client, barrier):
         barrier.wait()
         if op == 'TagResource':
-            arn = dynamodb.meta.client.describe_table(TableName=table_name)['Table']['TableArn']
-            dynamodb.meta.client.tag_resource(ResourceArn=arn, Tags=[{'Key': 'animal', 'Value': 'dog'}])
+            arn = client.describe_table(TableName=table_name)['Table']['TableArn']
+            client.tag_resource(ResourceArn=arn, Tags=[{'Key': 'animal', 'Value': 'dog'}])
         elif op == 'UntagResource':
-            arn = dynamodb.meta.client.describe_table(TableName=table_name)['Table']['TableArn']
-            dynamodb.meta.client.untag_resource(ResourceArn=arn, TagKeys=['animal'])
+            arn = client.describe_table(TableName=table_name)['Table']['TableArn']
+            client.untag_resource(ResourceArn=arn, TagKeys=['animal'])
         elif op == 'UpdateTimeToLive':
             # For the UpdateTimeToLive operation to actually attempt a write
             # (and possibly notice a collision), we need to set Enabled to
@@ -1096,31 +1150,29 @@ async def test_concurrent_modify_tags(manager: ManagerClient, op):
             # boolean - 50% of the time it will do the right thing and
             # we may see the collision.
             try:
-                dynamodb.meta.client.update_time_to_live(TableName=table_name,
+                client.update_time_to_live(TableName=table_name,
                     TimeToLiveSpecification={'AttributeName': 'xxx', 'Enabled': bool(random.getrandbits(1))})
             except ClientError as e:
-                if not 'TTL is already' in str(e):
+                if not 'TTL is already' in e.response['Error']['Message']:
                     raise
         else:
             pytest.fail(f'oops, bad op {op}')
-    alternators[0].create_table(TableName=table_name,
-        BillingMode='PAY_PER_REQUEST',
-        KeySchema=[{'AttributeName': 'p', 'KeyType': 'HASH' }],
-        AttributeDefinitions=[{'AttributeName': 'p', 'AttributeType': 'N' }])
-    alternators[0].meta.client.get_waiter('table_exists').wait(TableName=table_name)
+    await asyncio.to_thread(create_test_table, clients[0], table_name)
     ntries = 5
     try:
-        for i in range(ntries):
-            threads = [ThreadWrapper(target=run_op, args=[dynamodb]) for dynamodb in alternators]
-            for t in threads:
-                t.start()
-            try:
-                for t in threads:
-                    t.join()
-            finally:
-                barrier.reset()
+        # As in run_concurrent_tries(), the threads waiting on a barrier
+        # together need a thread each, which the event loop's default
+        # executor doesn't guarantee, so use a dedicated executor.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            # Warming up also starts all the executor's threads.
+            await warm_up_clients(clients, 1, executor)
+            for i in range(ntries):
+                # A fresh barrier for each try, so a try that failed while some
+                # threads were waiting on it can't leave it broken for the next.
+                barrier = threading.Barrier(len(clients), timeout=120)
+                await run_in_threads(run_op, [(client, barrier) for client in clients], executor)
     finally:
-        alternators[0].meta.client.delete_table(TableName=table_name)
+        await asyncio.to_thread(clients[0].delete_table, TableName=table_name)
 
 async def nodes_with_data(manager, ks, cf, host):
     """Retrieves a set of node uuids which contain *any* data for the given
@@ -1132,7 +1184,12 @@ async def nodes_with_data(manager, ks, cf, host):
        The information is retrieved using requests to the given "host",
        which can be any live node.
     """
-    r = await get_all_tablet_replicas(manager, host, ks, cf)
+    # We don't know yet which of the two requests we'll need, so send
+    # both concurrently instead of waiting for the first before sending
+    # the second.
+    r, j = await asyncio.gather(
+        get_all_tablet_replicas(manager, host, ks, cf),
+        manager.api.client.get_json('/storage_service/tokens_endpoint', host=host.ip_addr))
     if r:
         # If table uses tablets it will have a non-empty list of tablets (r)
         # and we return it here.
@@ -1140,9 +1197,10 @@ async def nodes_with_data(manager, ks, cf, host):
     else:
         # Otherwise, the table uses vnodes. Use the REST API that only
         # makes sense with vnodes. Convert the host IP addresses that this
-        # API returns to uuids like we have in the system tables
-        j = await manager.api.client.get_json('/storage_service/tokens_endpoint', host=host.ip_addr)
-        return { await manager.api.get_host_id(entry['value']) for entry in j }
+        # API returns to uuids like we have in the system tables. Many
+        # tokens share the same node, so look up each distinct address once.
+        ips = { entry['value'] for entry in j }
+        return set(await asyncio.gather(*(manager.api.get_host_id(ip) for ip in ips)))
 
 @pytest.mark.parametrize("tablets", [True, False])
 async def test_zero_token_node_load_balancer(manager, tablets):
@@ -1151,9 +1209,9 @@ async def test_zero_token_node_load_balancer(manager, tablets):
        issue #6527. We set up a cluster with four ordinary nodes (one DC and
        one rack), and a fifth node which doesn't have any data (a zero-token
        node), and make different Alternator requests (CreateTable, PutItem,
-       GetItem) to this data-less fifth node, and they should work. Finally
-       we verify that the fifth node really does not have any data (and
-       wasn't just created as a normal data-holding node).
+       GetItem, BatchWriteItem, BatchGetItem) to this data-less fifth node,
+       and they should work. Finally we verify that the fifth node really does not
+       have any data (and wasn't just created as a normal data-holding node).
        Because the implementation of zero-token nodes is very different
        for the tablets and vnodes cases, this test has two parametrized
        versions - tablets=True and tablets=False.
@@ -1173,7 +1231,7 @@ async def test_zero_token_node_load_balancer(manager, tablets):
     # Get an Alternator connection to the zero-token node:
     alternator = get_alternator(zero_token_server.ip_addr)
 
-    # Create a new table, write 10 different items to it and then read them
+    # Create a new table, write 11 different items to it and then read them
     # back - doing all of this through the zero-token node:
     table = alternator.create_table(TableName=unique_table_name(),
         Tags=tags,
@@ -1184,11 +1242,30 @@ async def test_zero_token_node_load_balancer(manager, tablets):
         AttributeDefinitions=[
             {'AttributeName': 'p', 'AttributeType': 'N' },
         ])
-    items = [{'p': i, 'x': f'hello {i}'} for i in range(10)]
-    for item in items:
-        table.put_item(Item=item)
-    for item in items:
-        assert item == table.get_item(Key={'p': item['p']}, ConsistentRead=True)['Item']
+    # The items are written and read in batches, so this takes just a
+    # couple of requests instead of one request per item - each item
+    # is still forwarded by the zero-token node to its own replicas.
+    # The items are built once, already in the low-level DynamoDB format,
+    # and used as-is by the low-level client for the writes, the reads'
+    # keys, and comparing the results.
+    client = alternator.meta.client
+    items = tuple({'p': {'N': str(i)}, 'x': {'S': f'hello {i}'}} for i in range(10))
+    request = {table.name: [{'PutRequest': {'Item': item}} for item in items]}
+    while request:
+        request = client.batch_write_item(RequestItems=request)['UnprocessedItems']
+    got_items = {}
+    request = {table.name: {'Keys': [{'p': item['p']} for item in items], 'ConsistentRead': True}}
+    while request:
+        response = client.batch_get_item(RequestItems=request)
+        for item in response['Responses'][table.name]:
+            got_items[item['p']['N']] = item
+        request = response['UnprocessedKeys']
+    assert got_items == {item['p']['N']: item for item in items}
+    # Single-item requests take a different path through the coordinator
+    # than the batches, so check them too.
+    item = {'p': {'N': '10'}, 'x': {'S': 'hello 10'}}
+    client.put_item(TableName=table.name, Item=item)
+    assert item == client.get_item(TableName=table.name, Key={'p': item['p']}, ConsistentRead=True)['Item']
     # Verify that the zero-token node is really "zero-token", i.e., does not
     # have any data for our table. The nodes_with_data() function returns
     # the list of node uuids which contain *any* data for the given table -
@@ -1197,9 +1274,10 @@ async def test_zero_token_node_load_balancer(manager, tablets):
     ks = f"alternator_{table.name}"
     repl = get_replication(manager.get_cql(), ks)
     if type(repl["dc1"]) is list:
-        expected = { await manager.get_host_id(s.server_id) for s in servers if s.rack in repl["dc1"] }
+        expected_servers = [s for s in servers if s.rack in repl["dc1"]]
     else:
-        expected = { await manager.get_host_id(s.server_id) for s in servers }
+        expected_servers = servers
+    expected = set(await asyncio.gather(*(manager.get_host_id(s.server_id) for s in expected_servers)))
     got = await nodes_with_data(manager, 'alternator_'+table.name, table.name, zero_token_server)
     assert got == expected
     table.delete()
@@ -1216,7 +1294,7 @@ async def test_alternator_concurrent_rmw_same_partition_different_server(manager
     """
     servers = await manager.servers_add(3, config=alternator_config, auto_rack_dc='dc1')
     alternator = get_alternator(servers[0].ip_addr)
-    ips = [server.ip_addr for server in await manager.running_servers()]
+    ips = tuple(server.ip_addr for server in servers)
     table = alternator.create_table(TableName=unique_table_name(),
         BillingMode='PAY_PER_REQUEST',
         KeySchema=[
@@ -1232,38 +1310,50 @@ async def test_alternator_concurrent_rmw_same_partition_different_server(manager
     # in that partition (its clustering key is the thread's number).
     # Each update gets sent to a random node (we have 3 nodes in ips).
     nthreads = 3
+    # Low-level clients are thread-safe, so all threads share one client
+    # per node.
+    clients = [get_alternator(ip).meta.client for ip in ips]
+    # Once one thread saw the error, the test will fail anyway, so the
+    # other threads stop instead of completing all their writes.
+    failed = threading.Event()
     def run_rmw(i):
-        rand = random.Random()
-        rand.seed(i)
-        alternators = [get_alternator(ip) for ip in ips]
+        # Build the request, and pick the sequence of nodes, up front, so
+        # the loop below does as little work as possible between
+        # consecutive writes. The request is serialized once to the
+        # low-level DynamoDB format and sent through the low-level client,
+        # skipping the resource's per-call serialization.
+        serialize = TypeSerializer().serialize
+        request = {
+            'TableName': table.name,
+            'Key': {'p': serialize(1), 'c': serialize(i)},
+            'UpdateExpression': 'SET v = if_not_exists(v, :init) + :incr',
+            'ExpressionAttributeValues': {':init': serialize(0), ':incr': serialize(1)},
+        }
+        rand = random.Random(i)
         # In about 1/10 runs, just one write from each thread is enough
         # to elicit the error. But if I want to get the error in almost
         # every run, I need to repeat the write more times, until two
         # of the writes collide and cause the bug.
-        for n in range(150):
-            alternator_i = rand.randrange(len(alternators))
-            alternator = alternators[alternator_i]
-            tbl = alternator.Table(table.name)
+        indices = [rand.randrange(len(clients)) for _ in range(150)]
+        for alternator_i in indices:
+            if failed.is_set():
+                return
+            client = clients[alternator_i]
             start = time.time()
             try:
-                tbl.update_item(Key={'p': 1, 'c': i},
-                    UpdateExpression='SET v = if_not_exists(v, :init) + :incr',
-                    ExpressionAttributeValues={':init': 0, ':incr': 1})
+                client.update_item(**request)
             except ClientError:
                 # The "raise" will cause this thread to fail, and eventually
-                # the join() and therefore the whole test will fail. We also
+                # run_in_threads() and therefore the whole test will fail. We also
                 # print the time it took for the failure, because it
                 # demonstrates that issue #16261 involves an immediate
                 # error (in less than 20ms), NOT a normal timeout.
                 print(f"In incrementing 1,{i} on node {alternator_i}: error after {time.time()-start}")
+                failed.set()
                 raise
 
-    threads = [ThreadWrapper(target=run_rmw, args=(i,)) for i in range(nthreads)]
-    for t in threads:
-        t.start()
     try:
-        for t in threads:
-            t.join()
+        await run_in_threads(run_rmw, [(i,) for i in range(nthreads)])
     finally:
         table.delete()
 
@@ -1350,8 +1440,7 @@ async def test_alternator_invalid_shard_for_lwt(manager: ManagerClient):
         while not stop_event.is_set():
             with table.batch_writer() as batch:
                 batch.put_item(Item={'p': 1, 'x': 'hellow world'})
-    t = ThreadWrapper(target=run_batch)
-    t.start()
+    batch_task = asyncio.create_task(asyncio.to_thread(run_batch))
 
     logger.info("Waiting for 'alternator_executor_batch_write_wait: hit'")
     await log.wait_for("alternator_executor_batch_write_wait: hit", from_mark=m)
@@ -1381,7 +1470,7 @@ async def test_alternator_invalid_shard_for_lwt(manager: ManagerClient):
     await intranode_migration_task
 
     stop_event.set()
-    t.join()
+    await batch_task
 
 @pytest.mark.skip_mode(mode='release', reason='error injections are not supported in release mode')
 async def test_deferred_stream_enablement_on_tablets(manager: ManagerClient):